@@ -1,14 +1,31 @@
 # app.py
+import logging
+
 import dash
-from dash import html, dcc
+import diskcache
+import plotly.io as pio
+from dash import html, dcc, DiskcacheManager
 import dash_bootstrap_components as dbc
 
+# Configure logging once for the whole app; page modules just call
+# logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Serialize all Plotly figures with orjson, which handles numpy arrays
+# natively and is several times faster than the stdlib encoder
+pio.json.config.default_engine = 'orjson'
+
+# Long-running callbacks (background=True) run through this manager so
+# they don't pin an HTTP worker while yfinance and Plotly grind
+background_callback_manager = DiskcacheManager(diskcache.Cache('./.dash_cache'))
+
 # Initialize the Dash app with Dash Pages enabled
 app = dash.Dash(
     __name__,
     use_pages=True,  # Enable Dash Pages
     suppress_callback_exceptions=True,
-    external_stylesheets=[dbc.themes.DARKLY]
+    external_stylesheets=[dbc.themes.DARKLY],
+    background_callback_manager=background_callback_manager
 )
 app.title = "Financial Dashboard"
 
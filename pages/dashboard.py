@@ -3,12 +3,22 @@ from dash import dcc, html, callback
 from dash.dependencies import Input, Output
 import plotly.graph_objects as go
 import pandas as pd
+import base64
+import io
+import itertools
 import logging
 import numpy as np
+import os
+import threading
+import time
+from datetime import date
+from matplotlib import cm
+from PIL import Image, ImageDraw
+import requests
 import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Register the page
@@ -62,154 +72,294 @@ sectors = {
     ],
 }
 
-# Global variables to store data
-stock_data = {}
-correlation_matrix = None
-transformed_mask = None
-sector_correlation_matrix = None
-sector_transformed_mask = None
+# Sector layout geometry is static: compute boundaries and label
+# annotations once at import instead of on every callback
+SECTOR_NAMES = list(sectors.keys())
+SECTOR_SIZES = [len(tickers) for tickers in sectors.values()]
+SECTOR_BOUNDARIES = list(itertools.accumulate(SECTOR_SIZES))
+SECTOR_ANNOTATIONS = [
+    dict(
+        x=start + size / 2,
+        y=-0.5,
+        text=name,
+        showarrow=False,
+        font=dict(size=12, color="white", family="Arial Black"),
+        yshift=-50,
+        bgcolor='rgba(0,0,0,0.5)',
+        borderpad=4
+    )
+    for name, start, size in zip(
+        SECTOR_NAMES,
+        [0] + SECTOR_BOUNDARIES[:-1],
+        SECTOR_SIZES
+    )
+]
 
-def download_data(period="5d"):
-    """Downloads data for the specified period and stores it in global variables."""
-    global stock_data, correlation_matrix, transformed_mask, sector_correlation_matrix, sector_transformed_mask
-    
-    logger.info(f"Downloading fresh data for period: {period}")
-    all_tickers = [ticker for sector_tickers in sectors.values() for ticker in sector_tickers]
-    
-    stock_data = {}
-    for symbol in all_tickers:
+# Cached results are reused for CACHE_TTL_SECONDS before a period is refetched
+CACHE_TTL_SECONDS = 600
+
+# Completed-period price history is immutable, so downloads are also
+# persisted to disk keyed by (period, date) and reused across restarts
+PRICE_CACHE_DIR = 'cache'
+
+def _price_cache_path(period):
+    return os.path.join(PRICE_CACHE_DIR, f'prices_{period}_{date.today()}.parquet')
+
+def _load_price_cache(cache_path):
+    """Loads the per-symbol price dict from a Parquet snapshot, or None."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        combined = pd.read_parquet(cache_path)
+        return {symbol: frame.droplevel('Symbol')
+                for symbol, frame in combined.groupby(level='Symbol', sort=False)}
+    except Exception as e:
+        logger.warning("Could not read price cache %s: %s", cache_path, e)
+        return None
+
+def _save_price_cache(cache_path, stock_data):
+    """Persists the per-symbol price dict as one snappy-compressed Parquet file."""
+    try:
+        os.makedirs(PRICE_CACHE_DIR, exist_ok=True)
+        combined = pd.concat(stock_data, names=['Symbol'])
+        combined.to_parquet(cache_path, compression='snappy')
+    except Exception as e:
+        logger.warning("Could not write price cache %s: %s", cache_path, e)
+
+def _numpy_corr(df):
+    """Pairwise correlation via BLAS matrix multiplies instead of DataFrame.corr().
+
+    Handles NaNs with a validity mask so the whole computation is a handful
+    of matmuls rather than pandas' per-column-pair Python loop. Runs in
+    float32: pct-change inputs carry far fewer significant digits than the
+    2-decimal heatmap display, and halving element size halves the memory
+    traffic through the gemm calls.
+    """
+    arr = df.to_numpy(dtype=np.float32)
+    mask = ~np.isnan(arr)
+    arr = np.where(mask, arr, np.float32(0.0))
+    fmask = mask.astype(np.float32)
+
+    counts = fmask.T @ fmask
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sums = arr.T @ fmask
+        means = sums / counts
+        # E[xy] over pairwise-valid rows, then covariance and normalization
+        prods = arr.T @ arr
+        cov = prods / counts - means * means.T
+        sq = (arr * arr).T @ fmask
+        var = sq / counts - means ** 2
+        std = np.sqrt(var)
+        corr = cov / (std * std.T)
+
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[counts < 2] = np.nan
+    return pd.DataFrame(corr, index=df.columns, columns=df.columns)
+
+def _cache_bucket():
+    """Returns a time bucket that rolls over every CACHE_TTL_SECONDS."""
+    return int(time.time() // CACHE_TTL_SECONDS)
+
+def _download_threaded(tickers, period):
+    """Per-ticker fallback fetch over a thread pool.
+
+    Used when the batched multi-symbol call returns nothing; the requests
+    are I/O-bound and independent, so 8 workers recover most of the batch
+    path's parallelism.
+    """
+    def _fetch_one(symbol):
         try:
-            data = yf.download(symbol, period=period, progress=False)
+            return symbol, yf.download(symbol, period=period, progress=False, timeout=10)
+        except (requests.RequestException, KeyError, ValueError) as e:
+            logger.warning("Fallback fetch failed for %s: %s", symbol, e)
+            return symbol, pd.DataFrame()
+
+    stock_data = {}
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        for symbol, data in ex.map(_fetch_one, tickers):
             if not data.empty:
                 stock_data[symbol] = data
-        except Exception as e:
-            logger.error(f"Error fetching data for {symbol}: {e}")
-            continue
+    return stock_data
+
+@lru_cache(maxsize=8)
+def _fetch(period, bucket):
+    """Downloads data for the period and returns the pct-change matrix.
+
+    Memoized per (period, time bucket) so repeated dropdown selections within
+    the TTL window are dict lookups instead of full network refetches. The
+    correlation matrices are derived lazily from this frame by the per-view
+    helpers, so a view that is never rendered never pays for its matrix.
+    """
+    # dict.fromkeys dedupes tickers shared between sectors while keeping
+    # sector order, so no symbol is requested or columned twice
+    all_tickers = list(dict.fromkeys(
+        ticker for sector_tickers in sectors.values() for ticker in sector_tickers
+    ))
+
+    cache_path = _price_cache_path(period)
+    stock_data = _load_price_cache(cache_path)
+
+    if stock_data is None:
+        logger.debug("Downloading fresh data for period: %s", period)
+        # Single batched request: yfinance multiplexes the symbols over a thread
+        # pool instead of one blocking HTTPS round trip per ticker.
+        raw = yf.download(
+            all_tickers,
+            period=period,
+            group_by='ticker',
+            threads=True,
+            auto_adjust=False,
+            progress=False
+        )
+
+        stock_data = {}
+        if not raw.empty:
+            fetched = set(raw.columns.levels[0])
+            stock_data = {
+                symbol: raw[symbol].dropna(how='all')
+                for symbol in all_tickers
+                if symbol in fetched and not raw[symbol].dropna(how='all').empty
+            }
+            missing = [symbol for symbol in all_tickers if symbol not in stock_data]
+            if missing:
+                logger.warning("No data returned for %d symbols: %s", len(missing), missing)
+
+        if not stock_data:
+            # Batch endpoint came back empty; retry per ticker over a thread pool
+            logger.warning("Batched download returned no data; falling back to per-ticker fetch")
+            stock_data = _download_threaded(all_tickers, period)
+
+        if stock_data:
+            _save_price_cache(cache_path, stock_data)
 
     if not stock_data:
         logger.error("No stock data was downloaded.")
-        return
+        return None
 
-    # Calculate daily percentage changes
-    pct_change_df = pd.DataFrame()
-    for symbol, data in stock_data.items():
-        data['Pct_Change'] = data['Close'].pct_change() * 100
-        pct_change_df[symbol] = data['Pct_Change']
+    # Calculate daily percentage changes once for the full close-price matrix
+    closes = pd.DataFrame({symbol: data['Close'] for symbol, data in stock_data.items()})
+    pct_change_df = (closes.pct_change() * 100).astype(np.float32)
 
-    # Calculate stock correlation matrix without masking
-    correlation_matrix = pct_change_df.corr()
-    transformed_mask = correlation_matrix  # No masking, show all correlations
-    
-    # Calculate sector returns
-    sector_returns = pd.DataFrame()
-    for sector, tickers in sectors.items():
-        valid_tickers = [t for t in tickers if t in stock_data]
-        if not valid_tickers:
-            continue
-            
-        sector_data = pd.DataFrame()
-        for ticker in valid_tickers:
-            returns = stock_data[ticker]['Close'].pct_change() * 100
-            sector_data[ticker] = returns
-        
-        sector_returns[sector] = sector_data.mean(axis=1)
-    
-    # Calculate sector correlation matrix without masking
-    sector_correlation_matrix = sector_returns.corr()
-    sector_transformed_mask = sector_correlation_matrix  # No masking, show all correlations
-    
-    logger.info("Data download and processing completed.")
+    # Restore full sector column order for the heatmap. The typed fill_value
+    # keeps the frame in a single float32 block instead of adding a separate
+    # float64 NaN block that would force consolidation on the next .values.
+    pct_change_df = pct_change_df.reindex(
+        columns=all_tickers, fill_value=np.float32(np.nan)
+    )
 
-def create_stock_heatmap():
-    """Creates a correlation heatmap using stored data."""
-    global correlation_matrix, transformed_mask
-    
-    if correlation_matrix is None:
-        download_data()
-    
+    # One vectorized data-coverage check at fetch time; downstream
+    # consumers never rescan the matrix for empty columns
+    empty_cols = pct_change_df.columns[~pct_change_df.notna().any()]
+    if len(empty_cols):
+        logger.warning("No usable pct-change data for %d symbols: %s",
+                       len(empty_cols), list(empty_cols))
+
+    # Single summary line per fetch; per-symbol detail stays at debug/warning
+    logger.info("Prepared pct-change data for %d symbols (period=%s)",
+                len(stock_data), period)
+    return pct_change_df
+
+@lru_cache(maxsize=8)
+def _stock_correlation(period, bucket):
+    """Stock correlation matrix for the period, derived from cached pct-changes."""
+    pct_change_df = _fetch(period, bucket)
+    if pct_change_df is None:
+        return None
+    return _numpy_corr(pct_change_df)
+
+@lru_cache(maxsize=8)
+def _sector_correlation(period, bucket):
+    """Sector correlation matrix for the period, computed only on demand."""
+    pct_change_df = _fetch(period, bucket)
+    if pct_change_df is None:
+        return None
+    # Sector returns: one column-subset mean per sector. Aggregating over
+    # each sector's own ticker list keeps shared tickers (AMZN sits in
+    # both Technology and Consumer Discretionary) counted in every sector
+    # they belong to, which a single symbol->sector map would drop
+    sector_returns = pd.concat(
+        {
+            sector: pct_change_df.loc[
+                :, pct_change_df.columns.intersection(tickers)
+            ].mean(axis=1)
+            for sector, tickers in sectors.items()
+        },
+        axis=1,
+    ).dropna(axis=1, how='all')
+    return _numpy_corr(sector_returns)
+
+@lru_cache(maxsize=8)
+def _stock_view(period, bucket):
+    """Pre-rendered stock heatmap image for the period."""
+    return create_stock_heatmap(_stock_correlation(period, bucket))
+
+@lru_cache(maxsize=8)
+def _sector_figure(period, bucket):
+    """Sector heatmap figure for the period, stored as a plain dict (Dash
+    accepts them) so the cached entry can't be mutated across requests the
+    way a shared go.Figure could."""
+    return create_sector_heatmap(_sector_correlation(period, bucket)).to_dict()
+
+# Pixels per matrix cell and bottom margin for sector labels in the
+# server-rendered stock heatmap image
+_HEATMAP_CELL_PX = 6
+_HEATMAP_LABEL_MARGIN_PX = 50
+
+def create_stock_heatmap(correlation_matrix):
+    """Renders the stock correlation matrix server-side as a static PNG.
+
+    Color-maps the matrix with RdBu, upscales it, and draws the sector
+    boundary lines, diagonal and sector labels straight into the image.
+    The browser receives one <img> instead of a Plotly figure with ~29k
+    cells, skipping the client-side render pipeline entirely for this
+    read-only view.
+    """
     if correlation_matrix is None:
         # Data download failed
-        fig = go.Figure()
-        fig.update_layout(
-            title="Stock Correlation Matrix - Data Not Available",
-            template='plotly_dark',
-            plot_bgcolor='#1E1E1E',
-            paper_bgcolor='#1E1E1E',
-            font=dict(color='white')
+        return html.Div(
+            "Stock Correlation Matrix - Data Not Available",
+            style={'color': 'white', 'textAlign': 'center', 'padding': '40px'}
         )
-        return fig
-    
-    fig = go.Figure(data=go.Heatmap(
-        z=transformed_mask,
-        x=correlation_matrix.columns,
-        y=correlation_matrix.columns,
-        colorscale='RdBu',
-        zmid=0,
-        zmin=-1,
-        zmax=1,
-        zsmooth="best",
-        hoverongaps=False,
-        hovertemplate='%{x} & %{y}<br>Correlation: %{z:.2f}<extra></extra>'  # Show values on hover only
-    ))
 
-    # Add sector divisions
-    sector_boundaries = []
-    current_position = 0
-    for sector, tickers in sectors.items():
-        current_position += len(tickers)
-        sector_boundaries.append(current_position)
-
-    for boundary in sector_boundaries[:-1]:
-        fig.add_shape(
-            type='line',
-            x0=boundary - 0.5, y0=-0.5,
-            x1=boundary - 0.5, y1=len(correlation_matrix.columns) - 0.5,
-            line=dict(color='rgba(255, 255, 255, 0.5)', width=2, dash='dot')
-        )
-        fig.add_shape(
-            type='line',
-            x0=-0.5, y0=boundary - 0.5,
-            x1=len(correlation_matrix.columns) - 0.5, y1=boundary - 0.5,
-            line=dict(color='rgba(255, 255, 255, 0.5)', width=2, dash='dot')
-        )
+    corr = np.nan_to_num(correlation_matrix.to_numpy(dtype=np.float32))
+    rgba = (cm.RdBu((corr + 1) / 2) * 255).astype(np.uint8)
 
-    # Add diagonal line
-    fig.add_shape(
-        type='line',
-        x0=-0.5, y0=-0.5,
-        x1=len(correlation_matrix.columns) - 0.5,
-        y1=len(correlation_matrix.columns) - 0.5,
-        line=dict(color='white', width=3)
-    )
+    n = len(correlation_matrix.columns)
+    size = n * _HEATMAP_CELL_PX
+    img = Image.fromarray(rgba, mode='RGBA').resize((size, size), Image.NEAREST)
 
-    # Add sector labels
-    annotations = []
-    start = 0
-    for sector, tickers in sectors.items():
-        end = start + len(tickers)
-        annotations.append(dict(
-            x=start + (end - start) / 2,
-            y=-0.5,
-            text=sector,
-            showarrow=False,
-            font=dict(size=12, color="white", family="Arial Black"),
-            yshift=-50,
-            bgcolor='rgba(0,0,0,0.5)',
-            borderpad=4
-        ))
-        start = end
+    canvas = Image.new('RGBA', (size, size + _HEATMAP_LABEL_MARGIN_PX), '#1E1E1E')
+    canvas.paste(img, (0, 0))
+    draw = ImageDraw.Draw(canvas)
 
-    # Update layout with consistent formatting
-    update_figure_layout(fig, "", len(correlation_matrix.columns))
-    return fig
+    # Sector boundary lines and the diagonal
+    for boundary in SECTOR_BOUNDARIES[:-1]:
+        offset = boundary * _HEATMAP_CELL_PX
+        draw.line([(offset, 0), (offset, size)], fill=(255, 255, 255, 128), width=2)
+        draw.line([(0, offset), (size, offset)], fill=(255, 255, 255, 128), width=2)
+    draw.line([(0, 0), (size, size)], fill=(255, 255, 255, 255), width=3)
+
+    # Sector labels along the bottom margin
+    for name, start, sector_size in zip(
+        SECTOR_NAMES, [0] + SECTOR_BOUNDARIES[:-1], SECTOR_SIZES
+    ):
+        center = (start + sector_size / 2) * _HEATMAP_CELL_PX
+        draw.text(
+            (center, size + _HEATMAP_LABEL_MARGIN_PX / 2),
+            name, fill='white', anchor='mm'
+        )
+
+    buffer = io.BytesIO()
+    canvas.save(buffer, format='PNG', optimize=True)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+
+    return html.Img(
+        src=f'data:image/png;base64,{encoded}',
+        style={'width': '100%', 'imageRendering': 'pixelated'}
+    )
 
-def create_sector_heatmap():
+def create_sector_heatmap(sector_correlation_matrix):
     """Creates a correlation heatmap for sectors."""
-    global sector_correlation_matrix, sector_transformed_mask
-    
-    if sector_correlation_matrix is None:
-        download_data()
-    
     if sector_correlation_matrix is None:
         # Data download failed
         fig = go.Figure()
@@ -223,18 +373,15 @@ def create_sector_heatmap():
         return fig
     
     fig = go.Figure(data=go.Heatmap(
-        z=sector_transformed_mask,
+        z=sector_correlation_matrix,
         x=sector_correlation_matrix.columns,
         y=sector_correlation_matrix.columns,
         colorscale='RdBu',  # Changed to RdBu for better correlation visualization
         zmid=0,
         zmin=-1,
         zmax=1,
-        zsmooth="best",
-        text=np.round(sector_transformed_mask, 2),  # Add correlation values as text
-        texttemplate='%{text}',  # Show the text for all cells
-        textfont={"size": 10},  # Slightly larger font for sector heatmap
-        hoverongaps=False
+        hoverongaps=False,
+        hovertemplate='%{x} & %{y}<br>Correlation: %{z:.2f}<extra></extra>'  # Show values on hover only
     ))
     
     # Add diagonal line
@@ -283,8 +430,16 @@ def update_figure_layout(fig, title, matrix_len):
         font=dict(color='white', family="Arial")
     )
 
-# Initial Data Download
-download_data()
+def _warm_cache(period="5d"):
+    """Pre-populates the data cache for the default period."""
+    try:
+        _fetch(period, _cache_bucket())
+    except Exception as e:
+        logger.error("Cache warm-up failed: %s", e)
+
+# Warm the default-period cache off the import path: the app serves
+# immediately and the first heatmap render finds the data already cached
+threading.Thread(target=_warm_cache, daemon=True).start()
 
 # Layout
 layout = html.Div([
@@ -308,22 +463,12 @@ layout = html.Div([
         )
     ], style={'textAlign': 'center', 'marginBottom': '20px'}),
     
-    # Stock Correlation Heatmap
+    # Stock Correlation Heatmap (served as a pre-rendered image)
     html.Div([
         dcc.Loading(
             id="loading-stock-heatmap",
             type="default",
-            children=dcc.Graph(
-                id='stock-correlation-heatmap',
-                config={
-                    'displayModeBar': True,
-                    'modeBarButtonsToRemove': [
-                        'zoom2d', 'pan2d', 'select2d', 'lasso2d', 'zoomIn2d', 'zoomOut2d',
-                        'autoScale2d', 'resetScale2d', 'toggleSpikelines',
-                        'hoverClosestCartesian', 'hoverCompareCartesian'
-                    ]
-                }
-            )
+            children=html.Div(id='stock-heatmap-container')
         )
     ], style={'width': '95%', 'margin': 'auto', 'marginBottom': '50px'}),
     
@@ -348,13 +493,21 @@ layout = html.Div([
 ], style={'backgroundColor': '#1E1E1E', 'minHeight': '100vh', 'padding': '30px'})
 
 # Callback
+# Split callbacks: each view derives its matrix lazily from the shared
+# pct-change cache, so under rapid period switches a never-rendered view
+# never pays for its correlation or figure build
+@callback(
+    Output('stock-heatmap-container', 'children'),
+    Input('correlation-period-dropdown', 'value')
+)
+def display_stock_heatmap(selected_period):
+    """Display the stock heatmap for the selected period."""
+    return _stock_view(selected_period, _cache_bucket())
+
 @callback(
-    [Output('stock-correlation-heatmap', 'figure'),
-     Output('sector-correlation-heatmap', 'figure')],
-    [Input('correlation-period-dropdown', 'value')]
+    Output('sector-correlation-heatmap', 'figure'),
+    Input('correlation-period-dropdown', 'value')
 )
-def display_heatmaps(selected_period):
-    """Display both heatmaps based on the selected period."""
-    # Download fresh data for the selected period
-    download_data(selected_period)
-    return create_stock_heatmap(), create_sector_heatmap()
\ No newline at end of file
+def display_sector_heatmap(selected_period):
+    """Display the sector heatmap for the selected period."""
+    return _sector_figure(selected_period, _cache_bucket())
\ No newline at end of file
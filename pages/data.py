@@ -1,5 +1,5 @@
 import dash
-from dash import dcc, html, callback
+from dash import dcc, html, callback, dash_table
 from dash.dependencies import Input, Output, State
 import dash_bootstrap_components as dbc
 from utils.data_manager import data_manager
@@ -7,33 +7,42 @@ from utils.data_processing import sectors, get_all_symbols
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Register the page
 dash.register_page(__name__, path='/data', name='Data Management')
 
+# Symbol universe is static; resolve it once at import
+_ALL_SYMBOLS = get_all_symbols()
+
+# Summary results keyed by the identity/size of the loaded frame, so
+# re-renders against unchanged data skip the full-column scans
+_summary_cache = {}
+
 def create_data_summary():
     """Creates a summary of the loaded data."""
     try:
-        if data_manager._data is None:
-            data_manager._data = data_manager._load_cache()
-            
-        if data_manager._data is None:
+        df = data_manager.data
+        if df is None:
             return "No cached data available", []
-            
-        # Get basic statistics
-        total_symbols = data_manager._data['Symbol'].nunique()
-        earliest_date = pd.to_datetime(data_manager._data['Date']).min()
-        latest_date = pd.to_datetime(data_manager._data['Date']).max()
-        total_data_points = len(data_manager._data)
-        
+
+        cache_key = (id(df), len(df))
+        if cache_key in _summary_cache:
+            return _summary_cache[cache_key]
+
+        # Get basic statistics (skip the parse when Date is already
+        # datetime64; cache=True dedupes repeated date strings otherwise)
+        total_symbols = df['Symbol'].nunique()
+        dates = df['Date']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, errors='coerce', cache=True)
+        earliest_date, latest_date = dates.min(), dates.max()
+        total_data_points = len(df)
+
         # Handle timestamp column safely
-        if 'timestamp' in data_manager._data.columns:
-            cache_age = datetime.now() - pd.to_datetime(data_manager._data['timestamp'].iloc[0])
+        if 'timestamp' in df.columns:
+            cache_age = datetime.now() - pd.to_datetime(df['timestamp'].iloc[0])
         else:
             cache_age = timedelta(0)  # Default to 0 if no timestamp
         
@@ -45,19 +54,23 @@ def create_data_summary():
         - Cache Age: {cache_age.days} days, {cache_age.seconds//3600} hours
         """
         
-        # Create coverage table
+        # Create coverage table: scan the Symbol column once, then use set
+        # intersection per sector instead of re-running unique() per symbol
+        available = set(df['Symbol'].unique())
         coverage_data = []
         for sector, symbols in sectors.items():
-            available_symbols = [s for s in symbols if s in data_manager._data['Symbol'].unique()]
+            have = available.intersection(symbols)
             coverage_data.append({
                 'Sector': sector,
                 'Total Symbols': len(symbols),
-                'Available Symbols': len(available_symbols),
-                'Coverage': f"{(len(available_symbols)/len(symbols))*100:.1f}%"
+                'Available Symbols': len(have),
+                'Coverage': f"{(len(have)/len(symbols))*100:.1f}%"
             })
-            
+
+        _summary_cache.clear()
+        _summary_cache[cache_key] = (summary_text, coverage_data)
         return summary_text, coverage_data
-        
+
     except Exception as e:
         logger.error(f"Error creating data summary: {e}")
         return "Error loading data summary", []
@@ -143,12 +156,10 @@ def handle_data_controls(clear_clicks, refresh_clicks, period):
     
     try:
         if not ctx.triggered:
-            # Initial load - try to load from cache first
-            data_manager._data = data_manager._load_cache()
-            if data_manager._data is None or data_manager._data.empty:
+            # Initial load - the property lazily reads the cache from disk
+            if data_manager.data is None or data_manager.data.empty:
                 # If no cache exists, fetch fresh data
-                symbols = get_all_symbols()
-                data_manager.get_stock_data(symbols, period)
+                data_manager.get_stock_data(_ALL_SYMBOLS, period)
             
             summary_text, coverage_data = create_data_summary()
             return "", False, "primary", summary_text, create_coverage_table(coverage_data)
@@ -165,8 +176,7 @@ def handle_data_controls(clear_clicks, refresh_clicks, period):
                 data_manager.clear_cache()
             
             # Get all symbols and fetch new data
-            symbols = get_all_symbols()
-            data_manager.get_stock_data(symbols, period)
+            data_manager.get_stock_data(_ALL_SYMBOLS, period)
             
             summary_text, coverage_data = create_data_summary()
             coverage_table = create_coverage_table(coverage_data)
@@ -182,13 +192,21 @@ def handle_data_controls(clear_clicks, refresh_clicks, period):
 
 def create_coverage_table(coverage_data):
     """Creates a formatted coverage table."""
-    return dbc.Table.from_dataframe(
-        pd.DataFrame(coverage_data),
-        striped=True,
-        bordered=True,
-        hover=True,
-        style={
+    if not coverage_data:
+        return None
+    # coverage_data is already a list of records, which is exactly the shape
+    # DataTable wants; skip the DataFrame and per-cell html component tree
+    columns = [{'name': col, 'id': col} for col in coverage_data[0]]
+    return dash_table.DataTable(
+        data=coverage_data,
+        columns=columns,
+        style_cell={
+            'backgroundColor': '#383838',
             'color': 'white',
-            'backgroundColor': '#383838'
+            'textAlign': 'left'
+        },
+        style_header={
+            'backgroundColor': '#2E2E2E',
+            'fontWeight': 'bold'
         }
     )
\ No newline at end of file
@@ -2,15 +2,14 @@ import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import logging
+import time
+from functools import lru_cache
 from typing import Dict, Tuple
+from utils import net_cache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Register the page
@@ -50,6 +49,60 @@ holdings_dict = {
     }
 }
 
+# Identical (tickers, period) requests within the TTL window are served
+# from memory instead of re-hitting Yahoo
+CACHE_TTL_SECONDS = 300
+
+def _cache_bucket():
+    """Returns a time bucket that rolls over every CACHE_TTL_SECONDS."""
+    return int(time.time() // CACHE_TTL_SECONDS)
+
+@lru_cache(maxsize=64)
+def _cached_download(tickers, period, bucket):
+    """Batched price download memoized per (tickers, period, TTL bucket).
+
+    Backed by the disk cache, so a cold worker restart reads the parsed
+    frame from disk instead of the network.
+    """
+    return net_cache.fetch_history(tickers, period, net_cache.today())
+
+def _divergence_and_rolling_std(etf: np.ndarray, holdings: np.ndarray,
+                                window: int):
+    """Fused normalize / subtract / rolling-std pass over raw ndarrays.
+
+    Produces both normalized series, their divergence, and the rolling
+    standard deviation in O(n) using cumulative sums, instead of four
+    separate pandas passes over the data. Accumulates in float64 whatever
+    the input dtype so the variance subtraction stays stable, and matches
+    pandas' rolling(window).std(): ddof=1, NaN until a window holds
+    `window` valid observations.
+    """
+    e = etf.astype(np.float64, copy=False)
+    h = holdings.astype(np.float64, copy=False)
+    e_norm = e / e[0] * 100.0
+    h_norm = h / h[0] * 100.0
+    div = e_norm - h_norm
+
+    n = len(div)
+    rstd = np.full(n, np.nan)
+    if n >= window > 1:
+        valid = ~np.isnan(div)
+        x = np.where(valid, div, 0.0)
+        c0 = np.cumsum(valid, dtype=np.float64)
+        c1 = np.cumsum(x)
+        c2 = np.cumsum(x * x)
+        cnt = c0[window - 1:].copy()
+        s1 = c1[window - 1:].copy()
+        s2 = c2[window - 1:].copy()
+        cnt[1:] -= c0[:n - window]
+        s1[1:] -= c1[:n - window]
+        s2[1:] -= c2[:n - window]
+        with np.errstate(invalid='ignore'):
+            var = np.where(cnt == window,
+                           (s2 - s1 * s1 / window) / (window - 1), np.nan)
+            rstd[window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return e_norm, h_norm, div, rstd
+
 def analyze_etf_divergence(
     etf_ticker: str,
     holdings: Dict[str, float],
@@ -58,86 +111,115 @@ def analyze_etf_divergence(
     min_days_between_signals: int = 10
 ) -> Tuple[go.Figure, dict]:
     try:
-        # Validate weights
-        total_weight = sum(holdings.values())
+        # Validate weights as an ndarray so normalization and the weighted
+        # average below stay in NumPy
+        weights = np.fromiter(holdings.values(), dtype=np.float64, count=len(holdings))
+        total_weight = weights.sum()
         if not 0.98 <= total_weight <= 1.02:
             logger.warning(f"Weights sum to {total_weight}, not 1.0. Normalizing weights.")
-            holdings = {k: v/total_weight for k, v in holdings.items()}
-
-        # Get ETF data
-        etf = yf.Ticker(etf_ticker)
-        etf_data = etf.history(period=period)['Close']
-
-        # Get holdings data and calculate weighted average
-        holdings_data = pd.DataFrame()
-        for stock, weight in holdings.items():
-            try:
-                stock_data = yf.Ticker(stock).history(period=period)['Close']
-                holdings_data[stock] = stock_data * weight
-            except Exception as e:
-                logger.error(f"Error fetching data for {stock}: {e}")
-                continue
-
-        if holdings_data.empty:
+            weights /= total_weight
+            holdings = dict(zip(holdings, weights))
+
+        # Fetch the ETF and all holdings in one batched request instead of
+        # one serial round trip per symbol
+        symbols = list(holdings.keys())
+        data = _cached_download(tuple(symbols + [etf_ticker]), period, _cache_bucket())
+
+        if data.empty or etf_ticker not in data.columns.levels[0]:
+            logger.error("No ETF data available")
+            return None, None
+        etf_data = data[etf_ticker]['Close'].dropna()
+
+        fetched = set(data.columns.levels[0])
+        available = [s for s in symbols if s in fetched]
+        if not available:
             logger.error("No holdings data available")
             return None, None
 
-        holdings_avg = holdings_data.sum(axis=1)
+        # Weighted average as a single matrix-vector product: one BLAS call
+        # over the close-price matrix instead of a per-symbol multiply and
+        # a summed axis
+        closes = pd.concat({s: data[s]['Close'] for s in available}, axis=1)
+        w = np.fromiter((holdings[s] for s in available), dtype=np.float64,
+                        count=len(available))
+        m = closes.to_numpy(dtype=np.float64)
+        # NaN-aware: zero out missing closes and renormalize each row over
+        # the weight actually present, so one holding with gaps (or an
+        # all-NaN column from a failed symbol in the batch) degrades the
+        # average instead of NaN-ing every date downstream. The constant
+        # scale change cancels in the h / h[0] normalization.
+        present = ~np.isnan(m)
+        w_present = present @ w
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg = np.where(present, m, 0.0) @ w / w_present
+        holdings_avg = pd.Series(avg, index=closes.index).dropna()
 
-        # Ensure both series have the same dates
-        common_dates = etf_data.index.intersection(holdings_avg.index)
-        if len(common_dates) == 0:
+        # Align both series on their common dates in one inner-join pass
+        # instead of an index intersection plus two label-based lookups
+        aligned = pd.concat(
+            [etf_data.rename('etf'), holdings_avg.rename('holdings')],
+            axis=1, join='inner'
+        )
+        if aligned.empty:
             logger.error("No common dates between ETF and holdings")
             return None, None
 
-        etf_data = etf_data[common_dates]
-        holdings_avg = holdings_avg[common_dates]
+        etf_data = aligned['etf']
+        holdings_avg = aligned['holdings']
 
-        # Normalize prices to starting point
-        etf_normalized = etf_data / etf_data.iloc[0] * 100
-        holdings_normalized = holdings_avg / holdings_avg.iloc[0] * 100
-
-        # Calculate divergence and rolling statistics
-        divergence = (etf_normalized - holdings_normalized)
-        rolling_std = divergence.rolling(window=rolling_window).std()
+        # Normalize, diverge, and compute rolling statistics in one fused
+        # numpy pass over the raw arrays
+        idx = etf_data.index
+        e_norm, h_norm, div_arr, rstd_arr = _divergence_and_rolling_std(
+            etf_data.to_numpy(), holdings_avg.to_numpy(), rolling_window
+        )
+        etf_normalized = pd.Series(e_norm, index=idx)
+        holdings_normalized = pd.Series(h_norm, index=idx)
+        divergence = pd.Series(div_arr, index=idx)
+        rolling_std = pd.Series(rstd_arr, index=idx)
 
-        # Create figure
+        # Create figure (plotly.subplots is imported lazily; it only loads
+        # on the first analysis instead of at worker boot)
+        from plotly.subplots import make_subplots
         fig = make_subplots(specs=[[{"secondary_y": True}]])
 
-        # Add main price traces
+        # Add main price traces as WebGL scatters fed raw ndarrays: typed
+        # buffers on the wire and GPU rendering client-side
         fig.add_trace(
-            go.Scatter(x=etf_normalized.index, y=etf_normalized,
+            go.Scattergl(x=etf_normalized.index.values, y=etf_normalized.values,
                       name=etf_ticker, line=dict(color="blue", width=2)),
             secondary_y=False
         )
 
         fig.add_trace(
-            go.Scatter(x=holdings_normalized.index, y=holdings_normalized,
+            go.Scattergl(x=holdings_normalized.index.values, y=holdings_normalized.values,
                       name="Holdings Average", line=dict(color="red", width=2)),
             secondary_y=False
         )
 
         # Add divergence trace
         fig.add_trace(
-            go.Scatter(x=divergence.index, y=divergence,
+            go.Scattergl(x=divergence.index.values, y=divergence.values,
                       name="Divergence", line=dict(color="orange", width=1)),
             secondary_y=True
         )
 
-        # Find crossover points
-        crossovers = []
-        for i in range(1, len(divergence)):
-            if (divergence.iloc[i-1] * divergence.iloc[i] <= 0):
-                crossovers.append(i)
+        # Count zero crossings with one vectorized sign pass instead of a
+        # Python loop of per-element .iloc lookups
+        arr = divergence.to_numpy()
+        sign = np.sign(arr)
+        crossover_mask = (sign[:-1] * sign[1:]) <= 0
+        n_crossovers = int(np.count_nonzero(crossover_mask & ~np.isnan(arr[1:])))
 
-        # Calculate statistics
+        # Calculate statistics straight off the ndarray already in hand;
+        # no per-stat Series reduction or .iloc indexer construction
         stats = {
-            'Max Divergence': divergence.max(),
-            'Min Divergence': divergence.min(),
-            'Mean Divergence': divergence.mean(),
-            'Std Deviation': divergence.std(),
-            'Current Divergence': divergence.iloc[-1],
-            'Number of Crossovers': len(crossovers),
+            'Max Divergence': float(np.nanmax(arr)),
+            'Min Divergence': float(np.nanmin(arr)),
+            'Mean Divergence': float(np.nanmean(arr)),
+            'Std Deviation': float(np.nanstd(arr, ddof=1)),
+            'Current Divergence': float(arr[-1]),
+            'Number of Crossovers': n_crossovers,
         }
 
         # Update layout
@@ -168,6 +250,26 @@ def analyze_etf_divergence(
         logger.error(f"Error in analyze_etf_divergence: {str(e)}")
         return None, None
 
+@lru_cache(maxsize=64)
+def _analysis_for(etf_ticker: str, period: str, rolling_window: int, day: str):
+    """Full analysis result memoized per (etf, period, window, day).
+
+    Toggling back to a previously viewed ETF skips the download, the
+    rolling statistics and the figure build entirely. The figure is held
+    as plain JSON so callers can rehydrate a fresh go.Figure and mutate
+    its layout without poisoning the cache; `day` rolls entries over when
+    the data refreshes.
+    """
+    holdings = holdings_dict.get(etf_ticker, {})
+    if not holdings:
+        return None, None
+    fig, stats = analyze_etf_divergence(etf_ticker, holdings, period, rolling_window)
+    if fig is None or stats is None:
+        # Raising keeps lru_cache from memoizing a transient failure for
+        # the rest of the day; the next callback retries the analysis
+        raise RuntimeError(f"Analysis failed for {etf_ticker}")
+    return fig.to_plotly_json(), stats
+
 # Layout
 layout = html.Div([
     # Dropdown container
@@ -250,14 +352,18 @@ layout = html.Div([
 )
 def update_etf_analysis(selected_etf):
     try:
-        holdings = holdings_dict.get(selected_etf, {})
-        if not holdings:
+        if selected_etf not in holdings_dict:
             return go.Figure(), "No holdings data available."
-            
-        fig, stats = analyze_etf_divergence(selected_etf, holdings)
-        
-        if fig is None or stats is None:
+
+        try:
+            fig_json, stats = _analysis_for(selected_etf, '1y', 20, net_cache.today())
+        except RuntimeError:
             return go.Figure(), "Analysis failed. Please try again."
+
+        if fig_json is None or stats is None:
+            return go.Figure(), "Analysis failed. Please try again."
+
+        fig = go.Figure(fig_json)
         
         # Update figure layout with proper margins and bottom legend
         fig.update_layout(
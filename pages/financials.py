@@ -1,34 +1,62 @@
 import dash
-from dash import dcc, html, callback
+from dash import dcc, html, callback, dash_table
 from dash.dependencies import Input, Output, State
 import dash_bootstrap_components as dbc
+import numpy as np
 import pandas as pd
-import yfinance as yf
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from utils import net_cache
 from utils.data_processing import get_all_symbols
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Register the page
 dash.register_page(__name__, path='/financials', name='Financial Statements')
 
+# Dropdown options are static; build them once at import instead of
+# allocating a dict per symbol on every layout render
+_ALL_SYMBOL_OPTIONS = [{'label': symbol, 'value': symbol} for symbol in get_all_symbols()]
+
+# Repeated statement/info requests within the TTL window are answered from
+# memory instead of re-hitting Yahoo
+CACHE_TTL_SECONDS = 300
+
+_STATEMENT_ATTRS = {
+    'income': 'income_stmt',
+    'balance': 'balance_sheet',
+    'cash': 'cashflow'
+}
+
+def _cache_bucket():
+    """Returns a time bucket that rolls over every CACHE_TTL_SECONDS."""
+    return int(time.time() // CACHE_TTL_SECONDS)
+
+@lru_cache(maxsize=512)
+def _cached_statement(symbol: str, statement_type: str, bucket: int) -> pd.DataFrame:
+    """Financial statement fetch memoized per (symbol, type, TTL bucket).
+
+    Backed by the disk cache so cold worker restarts read from disk.
+    """
+    return net_cache.fetch_statement(symbol, _STATEMENT_ATTRS[statement_type], net_cache.today())
+
+@lru_cache(maxsize=512)
+def _cached_info(symbol: str, bucket: int) -> dict:
+    """Ticker info fetch memoized per (symbol, TTL bucket)."""
+    return net_cache.fetch_info(symbol, net_cache.today())
+
 def get_financial_data(symbol: str, statement_type: str) -> pd.DataFrame:
     """
     Fetch financial statement data for a given symbol.
     statement_type can be: 'income', 'balance', 'cash'
     """
     try:
-        stock = yf.Ticker(symbol)
-        if statement_type == 'income':
-            return stock.income_stmt
-        elif statement_type == 'balance':
-            return stock.balance_sheet
-        elif statement_type == 'cash':
-            return stock.cashflow
-        return pd.DataFrame()
+        if statement_type not in _STATEMENT_ATTRS:
+            return pd.DataFrame()
+        return _cached_statement(symbol, statement_type, _cache_bucket())
     except Exception as e:
         logger.error(f"Error fetching {statement_type} statement for {symbol}: {e}")
         return pd.DataFrame()
@@ -51,7 +79,31 @@ def format_financial_value(value):
     else:
         return f"{'$' if value >= 0 else '-$'}{abs_value:.2f}"
 
-def create_financial_table(df: pd.DataFrame) -> dbc.Table:
+def _format_financial_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Format a numeric statement frame to display strings in one pass.
+
+    Buckets magnitudes into B/M/K with np.select and assembles the strings
+    with array operations, instead of calling format_financial_value once
+    per cell via .apply.
+    """
+    try:
+        vals = df.to_numpy(dtype=float, na_value=np.nan)
+    except (TypeError, ValueError):
+        # Mixed non-numeric content: fall back to the scalar formatter
+        return df.apply(lambda col: col.apply(format_financial_value))
+
+    absv = np.abs(vals)
+    big, mid, small = absv >= 1e9, absv >= 1e6, absv >= 1e3
+    with np.errstate(invalid='ignore'):
+        scaled = np.select([big, mid, small], [absv / 1e9, absv / 1e6, absv / 1e3], default=absv)
+    suffix = np.select([big, mid, small], ['B', 'M', 'K'], default='')
+    prefix = np.where(np.isnan(vals) | (vals >= 0), '$', '-$')
+    body = np.char.mod('%.2f', np.nan_to_num(scaled))
+    formatted = np.char.add(np.char.add(prefix.astype('<U2'), body), suffix.astype('<U1'))
+    out = np.where(np.isnan(vals), '-', formatted)
+    return pd.DataFrame(out, index=df.index, columns=df.columns)
+
+def create_financial_table(df: pd.DataFrame) -> dash_table.DataTable:
     """Create a formatted table for financial statements."""
     if df.empty:
         return html.Div("No financial data available", style={'color': 'white'})
@@ -63,32 +115,38 @@ def create_financial_table(df: pd.DataFrame) -> dbc.Table:
     formatted_dates = [d.strftime('%Y-%m-%d') if isinstance(d, pd.Timestamp) else str(d) for d in df.columns]
     df.columns = formatted_dates
     
-    # Format all numeric values
-    for col in df.columns:
-        df[col] = df[col].apply(format_financial_value)
-    
+    # Format all numeric values in one vectorized pass
+    df = _format_financial_frame(df)
+
+
     # Reset index to make metrics names a column
     df = df.reset_index()
     df = df.rename(columns={'index': 'Metric'})
     
-    return dbc.Table.from_dataframe(
-        df,
-        striped=True,
-        bordered=True,
-        hover=True,
-        style={
-            'color': 'white',
+    # DataTable ships the rows as plain records and lets the client render
+    # (and virtualize) them, instead of building one html component per cell
+    # server-side
+    return dash_table.DataTable(
+        data=df.to_dict('records'),
+        columns=[{'name': col, 'id': col} for col in df.columns],
+        virtualization=True,
+        fixed_rows={'headers': True},
+        style_table={'overflowX': 'auto'},
+        style_cell={
             'backgroundColor': '#383838',
-            'overflowX': 'auto'
+            'color': 'white',
+            'textAlign': 'left',
+            'minWidth': '120px'
+        },
+        style_header={
+            'backgroundColor': '#2E2E2E',
+            'fontWeight': 'bold'
         }
     )
 
-def create_key_metrics(symbol: str) -> html.Div:
-    """Create a summary of key financial metrics."""
+def create_key_metrics_from_info(info: dict) -> dash_table.DataTable:
+    """Create a summary of key financial metrics from a ticker info dict."""
     try:
-        stock = yf.Ticker(symbol)
-        info = stock.info
-        
         metrics = [
             ('Market Cap', info.get('marketCap', 'N/A')),
             ('P/E Ratio', info.get('trailingPE', 'N/A')),
@@ -101,23 +159,34 @@ def create_key_metrics(symbol: str) -> html.Div:
             ('Debt to Equity', info.get('debtToEquity', 'N/A')),
             ('Current Ratio', info.get('currentRatio', 'N/A'))
         ]
-        
-        return html.Div([
-            dbc.Row([
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.H6(metric, style={'color': 'white'}),
-                            html.P(format_financial_value(value) if isinstance(value, (int, float)) 
-                                  else str(value), style={'color': 'white'})
-                        ])
-                    ], style={'backgroundColor': '#383838', 'margin': '5px'})
-                ], width=3) for metric, value in metrics
-            ], className='g-0')
-        ])
-        
+
+        # One DataTable of records instead of ten nested Card trees: far
+        # fewer component objects to build and serialize per render
+        rows = [
+            {
+                'Metric': metric,
+                'Value': format_financial_value(value)
+                         if isinstance(value, (int, float)) else str(value)
+            }
+            for metric, value in metrics
+        ]
+        return dash_table.DataTable(
+            data=rows,
+            columns=[{'name': 'Metric', 'id': 'Metric'},
+                     {'name': 'Value', 'id': 'Value'}],
+            style_cell={
+                'backgroundColor': '#383838',
+                'color': 'white',
+                'textAlign': 'left'
+            },
+            style_header={
+                'backgroundColor': '#2E2E2E',
+                'fontWeight': 'bold'
+            }
+        )
+
     except Exception as e:
-        logger.error(f"Error creating key metrics for {symbol}: {e}")
+        logger.error(f"Error creating key metrics: {e}")
         return html.Div("Error loading key metrics", style={'color': 'white'})
 
 # Layout
@@ -130,7 +199,7 @@ layout = html.Div([
                     html.H4('Select Stock', style={'color': 'white'}),
                     dcc.Dropdown(
                         id='stock-selector-financials',
-                        options=[{'label': symbol, 'value': symbol} for symbol in get_all_symbols()],
+                        options=_ALL_SYMBOL_OPTIONS,
                         value=None,
                         placeholder='Select a stock symbol',
                         style={'color': 'black', 'backgroundColor': 'white'}
@@ -199,9 +268,14 @@ def update_financials(symbol, statement_type, n_clicks):
         return None, None, "", False, "primary"
     
     try:
-        # Fetch financial data
-        financial_df = get_financial_data(symbol, statement_type)
-        
+        # Fetch the statement and ticker info concurrently; they are
+        # independent network calls
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            stmt_future = ex.submit(get_financial_data, symbol, statement_type)
+            info_future = ex.submit(_cached_info, symbol, _cache_bucket())
+            financial_df = stmt_future.result()
+            info = info_future.result()
+
         if financial_df.empty:
             return (
                 html.Div("No financial data available", style={'color': 'white'}),
@@ -215,7 +289,7 @@ def update_financials(symbol, statement_type, n_clicks):
         financial_table = create_financial_table(financial_df)
         
         # Create key metrics
-        metrics = create_key_metrics(symbol)
+        metrics = create_key_metrics_from_info(info)
         
         return (
             financial_table,
@@ -5,26 +5,57 @@ import dash_bootstrap_components as dbc
 import pandas as pd
 import yfinance as yf
 import logging
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
+from utils import net_cache
 from utils.data_manager import data_manager
 from utils.data_processing import sectors, get_all_symbols
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Register the page
 dash.register_page(__name__, path='/insider-trades', name='Insider Trading')
 
+# Re-selecting a symbol within the TTL window reads from memory instead
+# of re-hitting Yahoo
+CACHE_TTL_SECONDS = 900
+
+def _cache_bucket():
+    """Returns a time bucket that rolls over every CACHE_TTL_SECONDS."""
+    return int(time.time() // CACHE_TTL_SECONDS)
+
+_tickers = None
+
+def _shared_tickers() -> yf.Tickers:
+    """One Tickers object for the whole symbol universe.
+
+    Built lazily on first use; every symbol access reuses the shared
+    cached session and its connection pool instead of constructing a
+    fresh Ticker per callback.
+    """
+    global _tickers
+    if _tickers is None:
+        _tickers = yf.Tickers(" ".join(get_all_symbols()),
+                              session=net_cache.session())
+    return _tickers
+
+@lru_cache(maxsize=256)
+def _cached_insider_trades(symbol: str, bucket: int) -> pd.DataFrame:
+    """Insider trades fetch memoized per (symbol, TTL bucket)."""
+    stock = _shared_tickers().tickers.get(symbol) \
+        or yf.Ticker(symbol, session=net_cache.session())
+    insider_trades = stock.insider_trades
+    if insider_trades is not None:
+        insider_trades['Symbol'] = symbol
+        return insider_trades
+    return pd.DataFrame()
+
 def get_insider_trades(symbol: str) -> pd.DataFrame:
     """Fetch insider trading data for a given symbol."""
     try:
-        stock = yf.Ticker(symbol)
-        insider_trades = stock.insider_trades
-        if insider_trades is not None:
-            insider_trades['Symbol'] = symbol
-            return insider_trades
-        return pd.DataFrame()
+        # Copy so table formatting can't mutate the cached frame
+        return _cached_insider_trades(symbol, _cache_bucket()).copy()
     except Exception as e:
         logger.error(f"Error fetching insider trades for {symbol}: {e}")
         return pd.DataFrame()
@@ -34,11 +65,12 @@ def create_insider_table(df: pd.DataFrame) -> dbc.Table:
     if df.empty:
         return html.Div("No insider trading data available", style={'color': 'white'})
     
-    # Format the DataFrame
+    # Format the DataFrame; map with a bound format keeps the string
+    # building vectorized instead of a per-cell lambda
     df = df.copy()
     df['Date'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m-%d')
-    df['Value'] = df['Value'].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "")
-    df['Shares'] = df['Shares'].apply(lambda x: f"{x:,.0f}" if pd.notnull(x) else "")
+    df['Value'] = df['Value'].map('${:,.2f}'.format, na_action='ignore').fillna('')
+    df['Shares'] = df['Shares'].map('{:,.0f}'.format, na_action='ignore').fillna('')
     
     return dbc.Table.from_dataframe(
         df,
@@ -51,9 +83,11 @@ def create_insider_table(df: pd.DataFrame) -> dbc.Table:
         }
     )
 
-# Layout
-layout = html.Div([
-    
+# Layout as a function: the options list is built when the page is
+# actually rendered, not at module import during app start
+def layout():
+    return html.Div([
+
     # Control Panel
     dbc.Card([
         dbc.CardBody([
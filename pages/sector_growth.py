@@ -1,64 +1,195 @@
 import dash
 from dash import dcc, html, callback
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import logging
 import numpy as np
+import threading
+import time
 import yfinance as yf
+from functools import lru_cache
+from utils import net_cache
 from utils.data_processing import sectors
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Register the page
 dash.register_page(__name__, path='/sector-growth', name='Sector Growth')
 
+# The ticker universe is static; flatten and dedupe it once at import
+# (dict.fromkeys keeps sector order for tickers shared between sectors)
+_ALL_TICKERS = tuple(dict.fromkeys(
+    ticker for sector_tickers in sectors.values() for ticker in sector_tickers
+))
+
+# Re-selecting a period within the TTL window re-renders from memory
+# instead of re-downloading and re-aggregating
+CACHE_TTL_SECONDS = 600
+
+def _cache_bucket():
+    """Returns a time bucket that rolls over every CACHE_TTL_SECONDS."""
+    return int(time.time() // CACHE_TTL_SECONDS)
+
+# Yahoo's spark endpoint returns close histories for up to 20 symbols in
+# one request, so a sector universe costs a handful of round-trips instead
+# of one per ticker
+_SPARK_URL = "https://query1.finance.yahoo.com/v8/finance/spark"
+_SPARK_BATCH = 20
+
+def _fetch_spark_chunk(chunk, period):
+    """Fetches one spark request worth of symbols as per-symbol frames."""
+    resp = net_cache.session().get(
+        _SPARK_URL,
+        params={'symbols': ','.join(chunk), 'range': period, 'interval': '1d'},
+        headers={'User-Agent': 'Mozilla/5.0'},
+        timeout=10
+    )
+    resp.raise_for_status()
+    out = {}
+    for item in resp.json()['spark']['result']:
+        try:
+            series = item['response'][0]
+            timestamps = series.get('timestamp')
+            closes = series['indicators']['quote'][0].get('close')
+            if not timestamps or not closes:
+                continue
+            data = pd.DataFrame(
+                {'Close': np.asarray(closes, dtype=np.float64)},
+                index=pd.to_datetime(timestamps, unit='s')
+            )
+            data['Pct_Change'] = data['Close'].pct_change() * 100
+            out[item['symbol']] = data
+        except (KeyError, IndexError, TypeError):
+            continue
+    return out
+
+def _fetch_yf_chunk(chunk, period):
+    """Fallback: one batched yf.download for the chunk."""
+    out = {}
+    batched = yf.download(
+        list(chunk), period=period, group_by='ticker',
+        auto_adjust=False, threads=True, progress=False,
+        session=net_cache.session()
+    )
+    if batched.empty:
+        return out
+    is_multi = isinstance(batched.columns, pd.MultiIndex)
+    for symbol in chunk:
+        if is_multi and symbol not in batched.columns.levels[0]:
+            continue
+        data = (batched[symbol] if is_multi else batched).dropna(how='all').copy()
+        if not data.empty:
+            data['Pct_Change'] = data['Close'].pct_change() * 100
+            out[symbol] = data
+    return out
+
 def fetch_and_process_data(symbols, period="5d"):
     """Fetches data for given symbols and calculates percentage change."""
     all_data = {}
-    for symbol in symbols:
+    for start in range(0, len(symbols), _SPARK_BATCH):
+        chunk = symbols[start:start + _SPARK_BATCH]
         try:
-            data = yf.download(symbol, period=period, progress=False)
-            if not data.empty:
-                # Calculate percentage change immediately
-                data['Pct_Change'] = data['Close'].pct_change() * 100
-                all_data[symbol] = data
+            all_data.update(_fetch_spark_chunk(chunk, period))
         except Exception as e:
-            logger.error(f"Error fetching data for {symbol}: {e}")
+            logger.error(f"Spark request failed ({chunk[0]}..{chunk[-1]}), "
+                         f"falling back to yf.download: {e}")
+            try:
+                all_data.update(_fetch_yf_chunk(chunk, period))
+            except Exception as e:
+                logger.error(f"Fallback download failed for chunk: {e}")
     return all_data
 
+# Static ticker -> sector lookup for the groupby aggregation below
+_SYMBOL_TO_SECTOR = {ticker: sector for sector, sector_tickers in sectors.items()
+                     for ticker in sector_tickers}
+
 def calculate_sector_averages(stock_data, sectors):
     """Calculates average percentage change for each sector."""
-    sector_avg_pct_change = {}
-    for sector, sector_tickers in sectors.items():
-        valid_changes = []
-        for ticker in sector_tickers:
-            if ticker in stock_data:
-                # Use last valid mean, excluding NaN values
-                mean_change = stock_data[ticker]['Pct_Change'].mean()
-                if not np.isnan(mean_change):
-                    valid_changes.append(mean_change)
-        sector_avg_pct_change[sector] = np.mean(valid_changes) if valid_changes else np.nan
+    sector_avg_pct_change = {sector: np.nan for sector in sectors}
+    if not stock_data:
+        return sector_avg_pct_change
+
+    # One long series over all tickers, then two C-level groupbys
+    # (ticker mean, then sector mean) instead of nested Python loops
+    combined = pd.concat(
+        {symbol: df['Pct_Change'] for symbol, df in stock_data.items()},
+        names=['Symbol', 'Date']
+    )
+    ticker_means = combined.groupby(level='Symbol').mean()
+    sector_means = ticker_means.groupby(ticker_means.index.map(_SYMBOL_TO_SECTOR)).mean()
+    sector_avg_pct_change.update(sector_means.to_dict())
     return sector_avg_pct_change
 
+@lru_cache(maxsize=16)
+def _stock_data_for(period, bucket):
+    """Fetched per-symbol frames memoized per (period, TTL bucket)."""
+    return fetch_and_process_data(_ALL_TICKERS, period=period)
+
+@lru_cache(maxsize=16)
+def _sector_avgs(period, bucket):
+    """Sector averages memoized per (period, TTL bucket).
+
+    Toggling back to a recently viewed period is an O(1) lookup instead
+    of a re-download and re-aggregation.
+    """
+    return calculate_sector_averages(_stock_data_for(period, bucket), sectors)
+
+# Cap on points per subplot trace; beyond this the figure JSON grows into
+# megabytes without adding visible detail
+_MAX_TRACE_POINTS = 500
+
+def _downsample_lttb(x, y, n_out=_MAX_TRACE_POINTS):
+    """Largest-Triangle-Three-Buckets downsampling to n_out points.
+
+    Keeps the visual shape of a series (peaks and troughs survive, unlike
+    stride sampling) while bounding the bytes Plotly has to serialize.
+    Series at or under the cap pass through untouched.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    yv = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if hi <= lo:
+            idx[i + 1] = prev = lo
+            continue
+        # Anchor C is the mean of the following bucket (or the last point)
+        nlo = edges[i + 1]
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        if nhi > nlo:
+            cx, cy = (nlo + nhi - 1) / 2.0, yv[nlo:nhi].mean()
+        else:
+            cx, cy = float(n - 1), yv[n - 1]
+        ax, ay = float(prev), yv[prev]
+        xs = np.arange(lo, hi)
+        areas = np.abs((ax - cx) * (yv[lo:hi] - ay) - (ax - xs) * (cy - ay))
+        prev = lo + int(np.argmax(areas))
+        idx[i + 1] = prev
+
+    return x[idx], np.asarray(y)[idx]
+
 def create_sector_growth_visualizations(period="5d"):
     """Creates both sector growth visualizations."""
     try:
-        # Get all tickers
-        all_tickers = [ticker for sector_tickers in sectors.values() for ticker in sector_tickers]
-        
-        # Fetch data with specified period
-        stock_data = fetch_and_process_data(all_tickers, period=period)
-        
+        # Fetch data with specified period (memoized per TTL bucket)
+        bucket = _cache_bucket()
+        stock_data = _stock_data_for(period, bucket)
+
         if not stock_data:
             logger.error("No stock data available")
             return go.Figure(), go.Figure()
 
         # Calculate sector averages
-        sector_avg_pct_change = calculate_sector_averages(stock_data, sectors)
+        sector_avg_pct_change = _sector_avgs(period, bucket)
 
         # Create ranked sectors dataframe
         ranked_sectors = sorted(
@@ -68,16 +199,20 @@ def create_sector_growth_visualizations(period="5d"):
         )
         ranked_df = pd.DataFrame(ranked_sectors, columns=['Sector', 'Average Pct Change'])
         
-        # Store numeric values for coloring
-        ranked_df['Numeric_Value'] = ranked_df['Average Pct Change'].apply(
-            lambda x: x if not np.isnan(x) else 0
-        )
-        
-        # Format percentage changes for table
-        ranked_df['Average Pct Change'] = ranked_df['Average Pct Change'].apply(
-            lambda x: f"{x:.2f}%" if not np.isnan(x) else "N/A"
+        # Numeric values for coloring and display strings, both in one
+        # vectorized pass instead of per-element lambdas
+        numeric = ranked_df['Average Pct Change']
+        ranked_df['Numeric_Value'] = numeric.fillna(0)
+        ranked_df['Average Pct Change'] = (
+            numeric.map('{:.2f}%'.format, na_action='ignore').fillna('N/A')
         )
 
+        # Single vectorized branch for the cell colors
+        value_colors = np.where(
+            ranked_df['Numeric_Value'].to_numpy() > 0,
+            'rgba(50, 171, 96, 0.2)', 'rgba(171, 50, 50, 0.2)'
+        ).tolist()
+
         # Create table visualization with enhanced styling
         table_fig = go.Figure(data=[go.Table(
             header=dict(
@@ -90,9 +225,7 @@ def create_sector_growth_visualizations(period="5d"):
             ),
             cells=dict(
                 values=[ranked_df.Sector, ranked_df['Average Pct Change']],
-                fill_color=['rgba(50, 50, 50, 1)', 
-                          ['rgba(50, 171, 96, 0.2)' if val > 0 else 'rgba(171, 50, 50, 0.2)' 
-                           for val in ranked_df['Numeric_Value']]],
+                fill_color=['rgba(50, 50, 50, 1)', value_colors],
                 align='left',
                 font=dict(size=13, color='white'),
                 line_color='rgba(255, 255, 255, 0.1)',
@@ -125,10 +258,16 @@ def create_sector_growth_visualizations(period="5d"):
             sector_tickers = sectors.get(sector, [])
             for ticker in sector_tickers:
                 if ticker in stock_data:
+                    # float32 halves bytes-on-wire, and long-period traces
+                    # are downsampled to the point cap before serialization
+                    xs, ys = _downsample_lttb(
+                        stock_data[ticker].index,
+                        stock_data[ticker]['Pct_Change'].to_numpy(dtype=np.float32)
+                    )
                     performance_fig.add_trace(
                         go.Scatter(
-                            x=stock_data[ticker].index,
-                            y=stock_data[ticker]['Pct_Change'],
+                            x=xs,
+                            y=ys,
                             mode='lines',
                             name=ticker,
                             showlegend=True,
@@ -171,8 +310,31 @@ def create_sector_growth_visualizations(period="5d"):
         logger.error(f"Error creating sector growth visualizations: {e}")
         return go.Figure(), go.Figure()
 
+# Every period the dropdown offers, in the order they're likely used
+_PERIODS = ('1mo', '3mo', '6mo', '1y')
+
+def _warm_caches():
+    """Pre-feeds the per-period caches shortly after startup.
+
+    Runs on a daemon thread so the first dropdown click for any period
+    usually finds data and averages already in memory; the stagger keeps
+    the warm-up from competing with the first real request.
+    """
+    for period in _PERIODS:
+        try:
+            _sector_avgs(period, _cache_bucket())
+        except Exception as e:
+            logger.error(f"Cache warm-up failed for period {period}: {e}")
+        time.sleep(2)
+
+threading.Thread(target=_warm_caches, daemon=True).start()
+
 # Define the layout
 layout = html.Div([
+    # Figures already sent to the browser, keyed by period; switching back
+    # to a seen period is a client-side lookup with no server round-trip
+    dcc.Store(id='sector-growth-figures'),
+
     # Period selector
     html.Div([
         dcc.Dropdown(
@@ -220,15 +382,50 @@ layout = html.Div([
 
 # Callbacks
 @callback(
-    [Output('sector-growth-table', 'figure'),
-     Output('sector-performance-subplots', 'figure')],
-    [Input('sector-period-dropdown', 'value')]
+    Output('sector-growth-figures', 'data'),
+    [Input('sector-period-dropdown', 'value')],
+    [State('sector-growth-figures', 'data')],
+    background=True,
+    running=[(Output('sector-period-dropdown', 'disabled'), True, False)]
 )
-def update_sector_growth(selected_period):
-    """Updates sector growth visualizations based on the selected period."""
+def load_sector_figures(selected_period, figures):
+    """Builds figures for periods the browser hasn't seen yet.
+
+    Periods already in the store are served client-side, so this only
+    runs (and only serializes figures) for a period's first view. It
+    runs as a background callback: a long build doesn't pin an HTTP
+    worker, and the dropdown is disabled while it's in flight.
+    """
+    figures = figures or {}
+    if selected_period in figures:
+        return dash.no_update
     try:
         table_fig, performance_fig = create_sector_growth_visualizations(period=selected_period)
-        return table_fig, performance_fig
+        figures[selected_period] = {
+            'table': table_fig.to_dict(),
+            'performance': performance_fig.to_dict()
+        }
     except Exception as e:
         logger.error(f"Error updating sector growth visualizations: {e}")
-        return go.Figure(), go.Figure()
\ No newline at end of file
+        # Leaving the period out of the store means the next selection
+        # retries instead of serving a permanently blank entry
+        return dash.no_update
+    return figures
+
+# Picking the figures for the selected period happens in the browser;
+# the server is only involved when the store lacks that period
+dash.clientside_callback(
+    """
+    function(figures, period) {
+        if (!figures || !figures[period]) {
+            return [window.dash_clientside.no_update,
+                    window.dash_clientside.no_update];
+        }
+        return [figures[period].table, figures[period].performance];
+    }
+    """,
+    [Output('sector-growth-table', 'figure'),
+     Output('sector-performance-subplots', 'figure')],
+    [Input('sector-growth-figures', 'data'),
+     Input('sector-period-dropdown', 'value')]
+)
\ No newline at end of file
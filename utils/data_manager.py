@@ -1,19 +1,22 @@
 import pandas as pd
-import yfinance as yf
 import logging
+import threading
 from datetime import datetime, timedelta
 import os
 from typing import Dict, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DataManager:
-    def __init__(self, cache_file: str = 'assets/stock_data_cache.csv'):
+    def __init__(self, cache_file: str = 'assets/stock_data_cache.feather'):
         self.cache_file = cache_file
+        # Caches written by earlier versions are still readable; new
+        # saves always go to Feather
+        self._legacy_parquet_file = 'assets/stock_data_cache.parquet'
+        self._legacy_cache_file = 'assets/stock_data_cache.csv'
         self.cache_duration = timedelta(hours=24)
         self._data = None
+        self._data_lock = threading.Lock()
         self.required_columns = [
             'Date',
             'Adj Close',
@@ -26,6 +29,19 @@ class DataManager:
             'Pct_Change'
         ]
         
+    @property
+    def data(self) -> Optional[pd.DataFrame]:
+        """The cached frame, lazily loaded from disk exactly once.
+
+        The lock stops concurrent callbacks from each paying the disk read
+        when they race on a cold worker.
+        """
+        if self._data is None:
+            with self._data_lock:
+                if self._data is None:
+                    self._data = self._load_cache()
+        return self._data
+
     def _process_stock_data(self, stock_data: pd.DataFrame, symbol: str) -> pd.DataFrame:
         """Process individual stock data to ensure correct format."""
         try:
@@ -46,21 +62,20 @@ class DataManager:
             return processed_data
 
         except Exception as e:
-            logger.error(f"Error processing data for {symbol}: {e}")
+            logger.error("Error processing data for %s: %s", symbol, e)
             return pd.DataFrame()
 
     def get_stock_data(self, symbols: list, period: str = '1y') -> Dict[str, pd.DataFrame]:
         """Get stock data either from cache or Yahoo Finance."""
         try:
-            # Try to load cache if data is not already loaded
-            if self._data is None:
-                self._data = self._load_cache()
-            
+            # The property loads the cache from disk on first access
+            cached = self.data
+
             # Check if cache is valid
             cache_is_valid = False
-            if self._data is not None and not self._data.empty:
-                if 'timestamp' in self._data.columns:
-                    last_update = pd.to_datetime(self._data['timestamp'].iloc[0])
+            if cached is not None and not cached.empty:
+                if 'timestamp' in cached.columns:
+                    last_update = pd.to_datetime(cached['timestamp'].iloc[0])
                     cache_is_valid = (datetime.now() - last_update) < self.cache_duration
 
             # Fetch new data if cache is invalid or empty
@@ -68,17 +83,33 @@ class DataManager:
                 logger.info("Fetching fresh data from Yahoo Finance")
                 all_stock_data = []
 
-                for symbol in symbols:
-                    try:
-                        stock = yf.download(symbol, period=period, progress=False)
-                        if not stock.empty:
-                            processed_stock = self._process_stock_data(stock, symbol)
-                            if not processed_stock.empty:
-                                all_stock_data.append(processed_stock)
-
-                    except Exception as e:
-                        logger.error(f"Error fetching data for {symbol}: {e}")
-                        continue
+                # One batched request for every symbol; yfinance fans the
+                # fetches out across threads instead of paying a serial
+                # round-trip per ticker. The fetch goes through the joblib
+                # disk cache, so a process restart re-reads the parsed
+                # frame from disk instead of the network
+                from . import net_cache
+                batched = net_cache.fetch_history(
+                    tuple(symbols), period, net_cache.today()
+                )
+
+                if not batched.empty:
+                    is_multi = isinstance(batched.columns, pd.MultiIndex)
+                    fetched = set(batched.columns.levels[0]) if is_multi else set(symbols[:1])
+                    for symbol in symbols:
+                        try:
+                            if symbol not in fetched:
+                                continue
+                            stock = batched[symbol] if is_multi else batched
+                            stock = stock.dropna(how='all')
+                            if not stock.empty:
+                                processed_stock = self._process_stock_data(stock.copy(), symbol)
+                                if not processed_stock.empty:
+                                    all_stock_data.append(processed_stock)
+
+                        except Exception as e:
+                            logger.error("Error processing data for %s: %s", symbol, e)
+                            continue
 
                 if all_stock_data:
                     combined_data = pd.concat(all_stock_data, ignore_index=True)
@@ -89,64 +120,100 @@ class DataManager:
                     logger.error("No data could be fetched")
                     return {}
 
-            return self._process_data(self._data.copy(), symbols)
+            # No defensive copy: _process_data only partitions and
+            # re-indexes, and groupby hands out independent sub-frames
+            return self._process_data(self._data, symbols)
 
         except Exception as e:
-            logger.error(f"Error in get_stock_data: {e}")
+            logger.error("Error in get_stock_data: %s", e)
             return {}
 
     def _save_cache(self, data: pd.DataFrame):
         """Save data to cache file."""
         try:
             if data is not None:
-                data.to_csv(self.cache_file, index=False)
+                # Arrow IPC keeps dtypes like Parquet but loads without a
+                # decompression/decode pass, so the warm-start read is
+                # essentially a straight copy off disk
+                data.reset_index(drop=True).to_feather(self.cache_file)
         except Exception as e:
-            logger.error(f"Error saving cache: {e}")
+            logger.error("Error saving cache: %s", e)
 
     def _load_cache(self) -> Optional[pd.DataFrame]:
         """Load data from cache file."""
         try:
             if os.path.exists(self.cache_file):
-                df = pd.read_csv(self.cache_file, low_memory=False)
-                df['Date'] = pd.to_datetime(df['Date'])
+                return pd.read_feather(self.cache_file)
+            if os.path.exists(self._legacy_parquet_file):
+                return pd.read_parquet(self._legacy_parquet_file)
+            if os.path.exists(self._legacy_cache_file):
+                try:
+                    # Explicit dtypes + parse_dates fold the type-inference
+                    # pass and the separate Date conversion into the one read
+                    df = pd.read_csv(
+                        self._legacy_cache_file,
+                        parse_dates=['Date'],
+                        dtype={
+                            'Open': 'float32',
+                            'High': 'float32',
+                            'Low': 'float32',
+                            'Close': 'float32',
+                            'Adj Close': 'float32',
+                            'Pct_Change': 'float32',
+                            'Volume': 'int64',
+                            'Symbol': 'category',
+                        },
+                    )
+                except (ValueError, TypeError, KeyError):
+                    # Caches written before the column layout settled can
+                    # repeat header names, which misaligns the dtype map;
+                    # fall back to the inferred read rather than dropping
+                    # the cache
+                    df = pd.read_csv(self._legacy_cache_file, low_memory=False)
+                    df['Date'] = pd.to_datetime(df['Date'])
                 if 'timestamp' in df.columns:
                     df['timestamp'] = pd.to_datetime(df['timestamp'])
                 return df
             return None
         except Exception as e:
-            logger.error(f"Error loading cache: {e}")
+            logger.error("Error loading cache: %s", e)
             return None
 
     def _process_data(self, df: pd.DataFrame, symbols: list) -> Dict[str, pd.DataFrame]:
         """Process the data into individual symbol dataframes."""
         try:
+            # One hash partition over the frame instead of a linear
+            # boolean-mask scan per symbol; Pct_Change was already computed
+            # in _process_stock_data and survives the cache round-trip, so
+            # there's nothing to recompute here
+            wanted = set(symbols)
             processed_data = {}
-            for symbol in symbols:
-                symbol_data = df[df['Symbol'] == symbol].copy()
-                if not symbol_data.empty:
-                    # Calculate percentage change for Adj Close only
-                    symbol_data['Pct_Change'] = symbol_data['Adj Close'].pct_change()
-                    
-                    # Set the date as index
-                    symbol_data.set_index('Date', inplace=True)
-                    
-                    processed_data[symbol] = symbol_data
-                    
+            for symbol, symbol_data in df.groupby('Symbol', sort=False):
+                if symbol in wanted and not symbol_data.empty:
+                    processed_data[symbol] = symbol_data.set_index('Date')
+
             return processed_data
             
         except Exception as e:
-            logger.error(f"Error processing data: {e}")
+            logger.error("Error processing data: %s", e)
             return {}
 
     def clear_cache(self):
         """Clear the cache file and memory cache."""
         try:
-            if os.path.exists(self.cache_file):
-                os.remove(self.cache_file)
+            for path in (self.cache_file, self._legacy_parquet_file,
+                         self._legacy_cache_file):
+                if os.path.exists(path):
+                    os.remove(path)
             self._data = None
+            # The joblib disk cache is keyed by calendar day, so without
+            # clearing it too a same-day refresh would just re-read the
+            # cached frame instead of hitting the network
+            from . import net_cache
+            net_cache.memory.clear(warn=False)
             logger.info("Cache cleared successfully")
         except Exception as e:
-            logger.error(f"Error clearing cache: {e}")
+            logger.error("Error clearing cache: %s", e)
 
 # Create a singleton instance
 data_manager = DataManager()
\ No newline at end of file
@@ -1,7 +1,13 @@
+from . import net_cache
 from .data_manager import data_manager
+import orjson
+import os
+import numpy as np
 import pandas as pd
 import logging
 import yfinance as yf
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 
@@ -23,16 +29,129 @@ sectors = {
     'Communication Services': ['GOOGL', 'META', 'NFLX', 'TMUS', 'VZ']
 }
 
+# Flattened once at import; dict.fromkeys dedupes while keeping sector
+# order, so downstream results are deterministic across processes unlike
+# the old set comprehension
+_ALL_SYMBOLS: tuple = tuple(dict.fromkeys(
+    symbol for symbols in sectors.values() for symbol in symbols
+))
+
 def get_all_symbols() -> list:
     """Get all unique symbols from sectors."""
-    return list(set([symbol for symbols in sectors.values() for symbol in symbols]))
+    return list(_ALL_SYMBOLS)
+
+# Inverse of `sectors`, built once at import: sector attribution becomes
+# an O(1) lookup instead of a scan over every sector's symbol list
+_SYMBOL_TO_SECTOR: Dict[str, str] = {
+    symbol: sector
+    for sector, symbols in sectors.items()
+    for symbol in symbols
+}
+
+# One Parquet file per period plus a small JSON sidecar recording when
+# each period was written; a fresh store short-circuits the whole
+# download/processing pipeline with a single columnar read
+CACHE_DIR = 'cache/periods'
+CACHE_INFO_FILE = os.path.join(CACHE_DIR, 'cache_info.json')
+CACHE_MAX_AGE = timedelta(hours=24)
+
+def get_parquet_filename(period: str) -> str:
+    """Path of the Parquet store for a period."""
+    return os.path.join(CACHE_DIR, f'stock_data_{period}.parquet')
+
+# Parsed cache_info.json memoized on the file's mtime, so repeated
+# freshness checks don't re-open and re-parse an unchanged file
+_cache_info_cache: Optional[tuple] = None
+
+def get_cache_info() -> dict:
+    """Read the period -> last-written-timestamp map."""
+    global _cache_info_cache
+    try:
+        if os.path.exists(CACHE_INFO_FILE):
+            mtime_ns = os.stat(CACHE_INFO_FILE).st_mtime_ns
+            if _cache_info_cache is not None and _cache_info_cache[0] == mtime_ns:
+                return _cache_info_cache[1]
+            with open(CACHE_INFO_FILE, 'rb') as f:
+                info = orjson.loads(f.read())
+            _cache_info_cache = (mtime_ns, info)
+            return info
+    except Exception as e:
+        logger.error("Error reading cache info: %s", e)
+    return {}
+
+def update_cache_info(period: str):
+    """Record that a period's store was just written."""
+    global _cache_info_cache
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        info = dict(get_cache_info())
+        info[period] = datetime.now().isoformat()
+        _cache_info_cache = None
+        with open(CACHE_INFO_FILE, 'wb') as f:
+            f.write(orjson.dumps(info))
+    except Exception as e:
+        logger.error("Error updating cache info: %s", e)
+
+def should_update_data(period: str) -> bool:
+    """Whether a period's store is missing or older than CACHE_MAX_AGE."""
+    written = get_cache_info().get(period)
+    if written is None or not os.path.exists(get_parquet_filename(period)):
+        return True
+    # Same-format ISO timestamps order lexicographically, so the
+    # freshness check is one string comparison with no parsing
+    cutoff = (datetime.now() - CACHE_MAX_AGE).isoformat()
+    return written < cutoff
+
+def save_period_store(combined_data: pd.DataFrame, period: str):
+    """Persist a combined frame (with Symbol column) for a period."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        combined_data.to_parquet(
+            get_parquet_filename(period), compression='snappy', index=False
+        )
+        update_cache_info(period)
+    except Exception as e:
+        logger.error("Error saving period store for %s: %s", period, e)
+
+# Split per-symbol frames memoized per period on the store file's mtime,
+# so repeat renders within a period skip the Parquet read and the groupby
+_period_frames_cache: dict = {}
+
+def load_period_store(period: str) -> Dict[str, pd.DataFrame]:
+    """Load a fresh period store as per-symbol frames, or {} if stale."""
+    try:
+        if should_update_data(period):
+            return {}
+        path = get_parquet_filename(period)
+        mtime_ns = os.stat(path).st_mtime_ns
+        hit = _period_frames_cache.get(period)
+        if hit is not None and hit[0] == mtime_ns:
+            return hit[1]
+        df = pd.read_parquet(path)
+        # Match the shape of the data_manager path: Date-indexed frames
+        # without the partition key, so consumers that align on the index
+        # (e.g. the per-sector concat) behave the same on every cache path
+        frames = {
+            symbol: group.drop(columns='Symbol').set_index('Date')
+            for symbol, group in df.groupby('Symbol', sort=False, observed=True)
+        }
+        _period_frames_cache[period] = (mtime_ns, frames)
+        return frames
+    except Exception as e:
+        logger.error("Error loading period store for %s: %s", period, e)
+        return {}
 
 def get_segmented_data(period: str = "1mo") -> Dict[str, pd.DataFrame]:
     """Get stock data for all symbols, downloading if necessary."""
     try:
         # Get all symbols
-        symbols = get_all_symbols()
-        
+        symbols = _ALL_SYMBOLS
+
+        # A fresh period store is one columnar read
+        stock_data = load_period_store(period)
+        if stock_data:
+            return stock_data
+
         # Try to get data from cache first
         stock_data = data_manager.get_stock_data(symbols, period)
         
@@ -44,33 +163,164 @@ def get_segmented_data(period: str = "1mo") -> Dict[str, pd.DataFrame]:
         return stock_data
     
     except Exception as e:
-        logger.error(f"Error in get_segmented_data: {e}")
+        logger.error("Error in get_segmented_data: %s", e)
         return {}
 
+def _finalize_symbol_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """Attach Pct_Change and move Date out of the index.
+
+    The symbol itself is carried as a concat key when the frames are
+    combined, not broadcast into a per-row column here.
+    """
+    # Calculate percentage change as one numpy divide over the raw array;
+    # Series.pct_change allocates a shifted copy and runs NaN bookkeeping
+    # this dense array doesn't need
+    adj = data['Adj Close'].to_numpy(dtype=np.float64)
+    pct = np.empty_like(adj)
+    pct[0] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct[1:] = adj[1:] / adj[:-1] - 1.0
+    data['Pct_Change'] = pct
+    # Prices and percent changes fit float32 comfortably; halving element
+    # size halves the cache I/O and the in-memory footprint of stock_data
+    float_cols = data.select_dtypes('float64').columns
+    if len(float_cols):
+        data[float_cols] = data[float_cols].astype(np.float32)
+    if 'Volume' in data.columns:
+        volume = data['Volume']
+        if volume.notna().all() and volume.abs().max() < np.iinfo(np.int32).max:
+            data['Volume'] = volume.astype(np.int32)
+    # Reset index to make Date a column
+    data.reset_index(inplace=True)
+    return data
+
+_CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}'
+
+def _fetch_chart_frames(symbols, period: str) -> Dict[str, pd.DataFrame]:
+    """Fetch per-symbol OHLCV frames from Yahoo's chart endpoint.
+
+    One asyncio event loop multiplexes all the requests over concurrent
+    connections (capped by a semaphore for politeness), so a batch of
+    stragglers costs roughly one round-trip of wall time with no thread
+    context-switching. Symbols whose response fails to parse are simply
+    absent from the result.
+    """
+    import asyncio
+    import aiohttp
+
+    async def fetch_one(session, sem, symbol):
+        async with sem:
+            async with session.get(
+                _CHART_URL.format(symbol=symbol),
+                params={'range': period, 'interval': '1d'}
+            ) as resp:
+                resp.raise_for_status()
+                payload = await resp.json()
+        result = payload['chart']['result'][0]
+        quote = result['indicators']['quote'][0]
+        adjclose = result['indicators'].get('adjclose', [{}])[0].get('adjclose')
+        frame = pd.DataFrame(
+            {
+                'Open': quote['open'],
+                'High': quote['high'],
+                'Low': quote['low'],
+                'Close': quote['close'],
+                'Adj Close': adjclose if adjclose is not None else quote['close'],
+                'Volume': quote['volume'],
+            },
+            index=pd.to_datetime(result['timestamp'], unit='s').normalize()
+        )
+        frame.index.name = 'Date'
+        return symbol, frame.dropna(how='all')
+
+    async def run():
+        out = {}
+        sem = asyncio.Semaphore(20)
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        async with aiohttp.ClientSession(headers=headers) as session:
+            tasks = [fetch_one(session, sem, symbol) for symbol in symbols]
+            for coro in asyncio.as_completed(tasks):
+                try:
+                    symbol, frame = await coro
+                    if not frame.empty:
+                        out[symbol] = frame
+                except Exception as e:
+                    logger.error("Chart fetch failed: %s", e)
+        return out
+
+    return asyncio.run(run())
+
 def download_fresh_data(symbols: list, period: str = "1mo") -> Dict[str, pd.DataFrame]:
     """Download fresh stock data for given symbols."""
     try:
         all_data = {}
-        for symbol in symbols:
-            try:
-                # Download data
-                data = yf.download(symbol, period=period, progress=False)
+
+        # One batched request for the whole list; yfinance threads the
+        # fetches internally instead of paying a serial round-trip per
+        # symbol
+        batched = yf.download(
+            list(symbols),
+            period=period,
+            group_by='ticker',
+            auto_adjust=False,
+            threads=True,
+            progress=False,
+            session=net_cache.session()
+        )
+
+        if not batched.empty:
+            is_multi = isinstance(batched.columns, pd.MultiIndex)
+            fetched = set(batched.columns.levels[0]) if is_multi else set(symbols[:1])
+            for symbol in symbols:
+                if symbol not in fetched:
+                    continue
+                data = (batched[symbol] if is_multi else batched).dropna(how='all').copy()
                 if not data.empty:
-                    # Add symbol column
-                    data['Symbol'] = symbol
-                    # Calculate percentage change
-                    data['Pct_Change'] = data['Adj Close'].pct_change()
-                    # Reset index to make Date a column
-                    data.reset_index(inplace=True)
-                    all_data[symbol] = data
-                    
+                    all_data[symbol] = _finalize_symbol_frame(data)
+
+        # Retry symbols the batch came back without against the chart
+        # endpoint, all multiplexed on one event loop
+        missing = [s for s in symbols if s not in all_data]
+        if missing:
+            try:
+                for symbol, frame in _fetch_chart_frames(missing, period).items():
+                    all_data[symbol] = _finalize_symbol_frame(frame)
             except Exception as e:
-                logger.error(f"Error downloading data for {symbol}: {e}")
-                continue
+                logger.error("Async chart fetch failed: %s", e)
+            missing = [s for s in symbols if s not in all_data]
+
+        # Anything still unresolved gets one last yfinance attempt on a
+        # small thread pool
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(16, len(missing))) as ex:
+                futures = {
+                    ex.submit(yf.download, s, period=period,
+                              auto_adjust=False, progress=False,
+                              session=net_cache.session()): s
+                    for s in missing
+                }
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        data = future.result()
+                        if not data.empty:
+                            all_data[symbol] = _finalize_symbol_frame(data.copy())
+                    except Exception as e:
+                        logger.error("Error downloading data for %s: %s", symbol, e)
                 
-        # Cache the downloaded data
+        # Cache the downloaded data. The symbol rides in as a concat key
+        # and lands as a categorical column: one string per symbol in
+        # memory instead of one per row
         if all_data:
-            combined_data = pd.concat([df for df in all_data.values()], ignore_index=True)
+            combined_data = pd.concat(all_data, names=['Symbol']).reset_index(level='Symbol')
+            # Pinning the categories to the module universe keeps the
+            # integer codes identical across periods and processes, so
+            # cached frames from different runs agree byte-for-byte
+            combined_data['Symbol'] = pd.Categorical(
+                combined_data['Symbol'], categories=_ALL_SYMBOLS
+            )
+            combined_data.reset_index(drop=True, inplace=True)
+            save_period_store(combined_data, period)
             combined_data['timestamp'] = datetime.now()
             data_manager._data = combined_data
             data_manager._save_cache(combined_data)
@@ -78,7 +328,7 @@ def download_fresh_data(symbols: list, period: str = "1mo") -> Dict[str, pd.Data
         return all_data
     
     except Exception as e:
-        logger.error(f"Error in download_fresh_data: {e}")
+        logger.error("Error in download_fresh_data: %s", e)
         return {}
 
 def get_sector_data(period: str = "1mo") -> Dict[str, pd.DataFrame]:
@@ -88,25 +338,31 @@ def get_sector_data(period: str = "1mo") -> Dict[str, pd.DataFrame]:
         if not stock_data:
             return {}
         
+        # One pass over the fetched frames; _SYMBOL_TO_SECTOR resolves
+        # each symbol's sector without re-scanning the sector lists
+        sector_cols: Dict[str, dict] = defaultdict(dict)
+        for symbol, data in stock_data.items():
+            sector = _SYMBOL_TO_SECTOR.get(symbol)
+            if sector is None or data.empty or 'Pct_Change' not in data.columns:
+                continue
+            sector_cols[sector][symbol] = data['Pct_Change']
+
         sector_data = {}
-        for sector, symbols in sectors.items():
-            sector_returns = pd.DataFrame()
-            for symbol in symbols:
-                if symbol in stock_data:
-                    data = stock_data[symbol]
-                    if not data.empty and 'Pct_Change' in data.columns:
-                        sector_returns[symbol] = data['Pct_Change']
-            
-            if not sector_returns.empty:
-                # Calculate sector average
-                sector_returns[sector] = sector_returns.mean(axis=1)
-                sector_returns['Date'] = pd.to_datetime(data.index)
-                sector_data[sector] = sector_returns
-                
+        for sector, cols in sector_cols.items():
+            # One concat per sector instead of column-by-column inserts,
+            # which reallocate and fragment the frame
+            sector_returns = pd.concat(cols, axis=1)
+            # Calculate sector average
+            sector_returns[sector] = sector_returns.mean(axis=1)
+            # The concat aligned all symbols on one index, so the dates
+            # come from it rather than whichever frame a loop saw last
+            sector_returns['Date'] = pd.to_datetime(sector_returns.index)
+            sector_data[sector] = sector_returns
+
         return sector_data
     
     except Exception as e:
-        logger.error(f"Error in get_sector_data: {e}")
+        logger.error("Error in get_sector_data: %s", e)
         return {}
 
 def calculate_sector_averages(sector_data):
@@ -120,15 +376,21 @@ def calculate_sector_averages(sector_data):
         pd.DataFrame: DataFrame with sector averages
     """
     try:
-        averages = {}
-        for sector, df in sector_data.items():
-            if not df.empty and sector in df.columns:
-                avg = df[sector].mean()
-                averages[sector] = avg
-                logger.info(f"Sector: {sector}, Average Pct Change: {avg}")
-                
-        return pd.DataFrame(list(averages.items()), columns=['Sector', 'Average_Change'])
+        averages = pd.Series(
+            {
+                sector: df[sector].mean()
+                for sector, df in sector_data.items()
+                if not df.empty and sector in df.columns
+            },
+            name='Average_Change', dtype='float64'
+        )
+        # Per-sector string formatting only when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            for sector, avg in averages.items():
+                logger.debug("Sector: %s, Average Pct Change: %s", sector, avg)
+
+        return averages.rename_axis('Sector').reset_index()
         
     except Exception as e:
-        logger.error(f"Error in calculate_sector_averages: {e}")
+        logger.error("Error in calculate_sector_averages: %s", e)
         return pd.DataFrame()
\ No newline at end of file
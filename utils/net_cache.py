@@ -0,0 +1,60 @@
+# utils/net_cache.py
+"""Disk-backed caching for yfinance network requests.
+
+The in-memory TTL caches on the pages die with the worker process; these
+joblib-backed wrappers persist parsed responses under cache/yf so a cold
+start reads from disk instead of re-hitting Yahoo. Each wrapper takes a
+`day` argument so entries naturally invalidate daily.
+"""
+import joblib
+from datetime import date
+
+memory = joblib.Memory(location='cache/yf', verbose=0)
+
+def today() -> str:
+    """Cache-key component that rolls the disk cache over daily."""
+    return date.today().isoformat()
+
+_session = None
+
+def session():
+    """A single shared HTTP session for all yfinance requests.
+
+    Reusing one session keeps connections alive across calls, and the
+    sqlite-backed response cache answers identical requests fired by
+    dropdown toggling locally instead of re-hitting Yahoo. Entries
+    expire after an hour.
+    """
+    global _session
+    if _session is None:
+        import requests_cache
+        _session = requests_cache.CachedSession(
+            'cache/yf_http', backend='sqlite', expire_after=3600
+        )
+    return _session
+
+@memory.cache
+def fetch_history(symbols: tuple, period: str, day: str):
+    """Batched price history for the given symbols."""
+    import yfinance as yf
+    return yf.download(
+        tickers=list(symbols),
+        period=period,
+        group_by='ticker',
+        auto_adjust=False,
+        threads=True,
+        progress=False,
+        session=session()
+    )
+
+@memory.cache
+def fetch_statement(symbol: str, attr: str, day: str):
+    """A financial statement attribute (income_stmt/balance_sheet/cashflow)."""
+    import yfinance as yf
+    return getattr(yf.Ticker(symbol, session=session()), attr)
+
+@memory.cache
+def fetch_info(symbol: str, day: str) -> dict:
+    """The ticker info dict."""
+    import yfinance as yf
+    return yf.Ticker(symbol, session=session()).info